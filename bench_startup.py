@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+#    Copyright (C) 2025 Radu Ioan Bot (radu.bot@univie.ac.at)
+#                       Enis Chenchene (enis.chenchene@univie.ac.at)
+#                       Robert Csetnek (robert.csetnek@univie.ac.at)
+#                       David Hulett (david.hulett@univie.ac.at)
+#
+#    This file is part of the example code repository for the paper:
+#
+#      R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+#      Accelerating Diagonal Methods for Bilevel Optimization:
+#      Unified Convergence via Continuous-Time Dynamics
+#      2025. DOI: 10.48550/arXiv.2505.14389.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Measures the startup time of the entry points of this repository, i.e. the
+time to import the modules used to run the experiments in:
+
+R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+Accelerating Diagonal Methods for Bilevel Optimization:
+Unified Convergence via Continuous-Time Dynamics.
+2025. DOI: 10.48550/arXiv.2505.14389.
+
+Usage:
+
+    python3 bench_startup.py [--repeat N] [--top K]
+
+For each entry point, a fresh interpreter is started N times and the median
+wall time is reported, together with the K slowest imports (cumulative) as
+measured by python -X importtime.
+
+For any comment, please contact: enis.chenchene@gmail.com
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+ENTRY_POINTS = {'interpreter': 'pass',
+                'main': 'import main',
+                'experiments': 'import experiments',
+                'sweep': 'import sweep',
+                'optimization': 'import optimization',
+                'nemirovsky_example': 'import nemirovsky_example',
+                'logistic_regression': 'import logistic_regression',
+                'plots': 'import plots'}
+
+
+def _time(code, repeat):
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-c', code],
+                              capture_output=True)
+        if proc.returncode:
+            return None
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+
+def _slowest_imports(code, top):
+
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                         check=True, capture_output=True, text=True).stderr
+
+    imports = []
+    for line in out.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):
+            # top-level imports only
+            imports.append((int(cumulative), name.strip()))
+
+    return sorted(imports, reverse=True)[:top]
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description='Benchmark startup time')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    for name, code in ENTRY_POINTS.items():
+        median = _time(code, args.repeat)
+        if median is None:
+            print(f'{name:>20}: import failed')
+            continue
+        print(f'{name:>20}: {median * 1e3:8.1f} ms')
+        for cumulative, module in _slowest_imports(code, args.top):
+            print(f'{"":>22}{module:<30}{cumulative / 1e3:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -36,39 +36,34 @@ For any comment, please contact: enis.chenchene@gmail.com
 """
 
 import numpy as np
-import logistic_regression as lr
-import nemirovsky_example as nem
 import optimization as opt
-import plots as show
-from tqdm import tqdm
 
 
-def experiment_nemirovsky():
+METHODS = ('Bi_PG', 'biFI', 'FBi_PG', 'staBiM', 'Bi_SG_II')
+
+
+def experiment_nemirovsky(dim=7, J=4, maxit=2000, cases=20,
+                          dtype=np.float64, path=None, samples=None,
+                          log=False):
+    '''
+    Experiment in Section 5.2. The recorded matrices are kept in a
+    results.Results container; pass path (disk memmaps), dtype=np.float32,
+    samples (log-spaced iterations) or log=True (with samples) to bound its
+    memory.
+    '''
+
+    import nemirovsky_example as nem
+    import plots as show
+    import results
+    from tqdm import tqdm
 
-    dim = 7
-    J = 4
-    maxit = 2000
-    cases = 20
     np.random.seed(0)
 
     # storage
-    Res_Bi_PG = np.zeros((maxit, cases))
-    Res_biFI = np.zeros((maxit, cases))
-    Res_FBi_PG = np.zeros((maxit, cases))
-    Res_staBiM = np.zeros((maxit, cases))
-    Res_Bi_SG_II = np.zeros((maxit, cases))
-
-    Obj_Bi_PG = np.zeros((maxit, cases))
-    Obj_biFI = np.zeros((maxit, cases))
-    Obj_FBi_PG = np.zeros((maxit, cases))
-    Obj_staBiM = np.zeros((maxit, cases))
-    Obj_Bi_SG_II = np.zeros((maxit, cases))
-
-    Obj_H_Bi_PG = np.zeros((maxit, cases))
-    Obj_H_biFI = np.zeros((maxit, cases))
-    Obj_H_FBi_PG = np.zeros((maxit, cases))
-    Obj_H_staBiM = np.zeros((maxit, cases))
-    Obj_H_Bi_SG_II = np.zeros((maxit, cases))
+    names = [f'{prefix}_{method}' for prefix in ('Res', 'Obj', 'Obj_H')
+             for method in METHODS]
+    Results = results.Results(names, maxit, cases, dtype=dtype, path=path,
+                              samples=samples, log=log)
 
     # contains delta
     Spects = np.linspace(1 + 1e-1, 2 - 1e-1, cases)
@@ -90,43 +85,113 @@ def experiment_nemirovsky():
 
         # step-size
         delta = Spects[cs]
-        # Spects.append(delta)
 
         # Algorithm 1 (our paper)
-        Res_Bi_PG[:, cs], Obj_Bi_PG[:, cs], Obj_H_Bi_PG[:, cs] = \
-            opt.Bi_PG(x_init, sigma_e, s, c, delta, Model, maxit)
+        Results.store_run('Bi_PG', cs,
+                          opt.Bi_PG(x_init, sigma_e, s, c, delta, Model,
+                                    maxit))
 
         # Algorithm 2 (our paper)
-        Res_biFI[:, cs], Obj_biFI[:, cs], Obj_H_biFI[:, cs] = \
-            opt.bi_FISTA(x_init, alpha, sigma_e, sigma_t, s, c, delta, Model,
-                         maxit)
+        Results.store_run('biFI', cs,
+                          opt.bi_FISTA(x_init, alpha, sigma_e, sigma_t, s, c,
+                                       delta, Model, maxit))
 
         # Fast Bi-level Proximal Gradient (Merchav, Sabach, Teboulle, '24)
-        Res_FBi_PG[:, cs], Obj_FBi_PG[:, cs], Obj_H_FBi_PG[:, cs] =\
-            opt.FBi_PG(x_init, alpha, s, c, delta, Model, maxit)
+        Results.store_run('FBi_PG', cs,
+                          opt.FBi_PG(x_init, alpha, s, c, delta, Model,
+                                     maxit))
 
         # Static Bilevel Method (Latafat, Themelis, Villa, Patrinos, '24)
-        Res_staBiM[:, cs], Obj_staBiM[:, cs], Obj_H_staBiM[:, cs] = \
-            opt.staBiM(x_init, sigma_e, c, delta, Model, maxit)
+        Results.store_run('staBiM', cs,
+                          opt.staBiM(x_init, sigma_e, c, delta, Model, maxit))
 
         # Bi-Sub-Gradient - Version II (Merchav, Sabach, '23)
-        Res_Bi_SG_II[:, cs], Obj_Bi_SG_II[:, cs], Obj_H_Bi_SG_II[:, cs] = \
-            opt.Bi_SG_II(x_init, c, delta, Model, maxit)
+        Results.store_run('Bi_SG_II', cs,
+                          opt.Bi_SG_II(x_init, c, delta, Model, maxit))
+
+    Results.flush()
 
-    show.plot_nemirovsky(Res_Bi_PG, Res_biFI, Res_FBi_PG, Res_staBiM,
-                         Res_Bi_SG_II, Obj_Bi_PG, Obj_biFI, Obj_FBi_PG,
-                         Obj_staBiM, Obj_Bi_SG_II, Obj_H_Bi_PG, Obj_H_biFI,
-                         Obj_H_FBi_PG, Obj_H_staBiM, Obj_H_Bi_SG_II,
-                         maxit, Spects, cases)
+    show.plot_nemirovsky(*(Results[name] for name in names),
+                         maxit, Spects, cases, its=Results.its)
 
 
-def experiment_logistic():
+def experiment_nemirovsky_scaling(dims=(10 ** 3, 10 ** 5, 10 ** 7), J=4,
+                                  operators=None, maxit=20):
+    '''
+    Stress test: time per iteration and peak memory of each method on the
+    example in Section 5.2 as the dimension grows
+    '''
+
+    import time
+    import tracemalloc
+    import nemirovsky_example as nem
+
+    if operators is None:
+        operators = nem.OPERATORS
+
+    # parameters
+    alpha = 4
+    sigma_e = 1e1
+    sigma_t = 20
+    c = 1e1
+    delta = 1.5
+
+    for dim in dims:
+        for operator in operators:
+
+            Model = nem.Nemirowki_Example(J, dim, operator=operator)
+            s = 0.95 / Model.L_2
+            x_init = np.zeros(Model.dim)
+
+            solvers = {
+                'Alg. 1': lambda: opt.Bi_PG(x_init, sigma_e, s, c, delta,
+                                            Model, maxit),
+                'Alg. 2': lambda: opt.bi_FISTA(x_init, alpha, sigma_e,
+                                               sigma_t, s, c, delta, Model,
+                                               maxit),
+                'FBi-PG': lambda: opt.FBi_PG(x_init, alpha, s, c, delta,
+                                             Model, maxit),
+                'staBiM': lambda: opt.staBiM(x_init, sigma_e, c, delta,
+                                             Model, maxit),
+                'Bi-SG-II': lambda: opt.Bi_SG_II(x_init, c, delta, Model,
+                                                 maxit)}
+
+            for name, solver in solvers.items():
+
+                # tracemalloc slows down allocations: separate passes
+                start = time.perf_counter()
+                solver()
+                elapsed = (time.perf_counter() - start) / maxit
+
+                tracemalloc.start()
+                solver()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                print(f'dim={dim:>9} {operator:>11} {name:>8}: '
+                      f'{elapsed * 1e3:9.3f} ms/it, '
+                      f'peak {peak / 2 ** 20:9.1f} MiB')
+
+
+def experiment_logistic(tol_f=None):
+    '''
+    Experiment in Section 5.3. Fs are reported as gaps to the (cached)
+    reference value; with tol_f, the methods stop once the gap is below it.
+    '''
+
+    import logistic_regression as lr
+    import plots as show
+    import reference
 
     # initializing model
     X_train, y_train = lr.load_dataset(1)
     Model = lr.Logistic_Regression(X_train, y_train)
     print('Dataset downloaded')
 
+    # reference (the data are separable: inf f = 0, no outer solution)
+    Model.set_reference(*reference.load(Model))
+    stop = None if tol_f is None else reference.target_gap(tol_f)
+
     # parameter
     alpha = 4
     sigma_e = 1
@@ -142,28 +207,28 @@ def experiment_logistic():
     # Algorithm 1 (our paper)
     print('Starting Algorithm 1 ...')
     Res_Bi_PG, Obj_Bi_PG, Obj_H_Bi_PG = \
-        opt.Bi_PG(x_init, sigma_e, s, c, delta, Model, maxit)
+        opt.Bi_PG(x_init, sigma_e, s, c, delta, Model, maxit, stop=stop)
 
     # Algorithm 2 (our paper)
     print('Starting Algorithm 2 ...')
     Res_biFI, Obj_biFI, Obj_H_biFI = \
         opt.bi_FISTA(x_init, alpha, sigma_e, sigma_t, s, c, delta, Model,
-                     maxit)
+                     maxit, stop=stop)
 
     # Fast Bi-level Proximal Gradient (Merchav, Sabach, Teboulle, '24)
     print('Starting Fast Bi-Level Proximal Gradient ...')
     Res_FBi_PG, Obj_FBi_PG, Obj_H_FBi_PG = \
-        opt.FBi_PG(x_init, alpha, s, c, delta, Model, maxit)
+        opt.FBi_PG(x_init, alpha, s, c, delta, Model, maxit, stop=stop)
 
     # Static Bilevel Method (Latafat, Themelis, Villa, Patrinos, '24)
     print('Starting Static Bilevel Method ...')
     Res_staBiM, Obj_staBiM, Obj_H_staBiM = \
-        opt.staBiM(x_init, sigma_e, c, delta, Model, maxit)
+        opt.staBiM(x_init, sigma_e, c, delta, Model, maxit, stop=stop)
 
     # Bi-Sub-Gradient - Version II (Merchav, Sabach, '23)
     print('Starting Bi-Sub-Gradient Version II ...')
     Res_Bi_SG_II, Obj_Bi_SG_II, Obj_H_Bi_SG_II = \
-        opt.Bi_SG_II(x_init, c, delta, Model, maxit)
+        opt.Bi_SG_II(x_init, c, delta, Model, maxit, stop=stop)
 
     show.plot_logistic(Res_Bi_PG, Res_biFI, Res_FBi_PG, Res_staBiM,
                        Res_Bi_SG_II, Obj_Bi_PG, Obj_biFI, Obj_FBi_PG,
@@ -36,61 +36,193 @@ Unified Convergence via Continuous-Time Dynamics.
 For any comment, please contact: enis.chenchene@gmail.com
 """
 
+import os
+import pathlib
 import numpy as np
-import pandas as pd
-from sklearn.datasets import load_breast_cancer
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.preprocessing import PolynomialFeatures
 import structures as st
 
 
-def load_dataset(dataset=1):
+def _load_breast_cancer(degree, seed):
     '''
-    Loading the dataset
+    Breast cancer dataset with polynomial features (train split)
     '''
 
-    if dataset == 1:
+    # heavy imports are deferred to cache misses
+    from sklearn.datasets import load_breast_cancer
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.preprocessing import PolynomialFeatures
 
-        data = load_breast_cancer()
-        df = pd.DataFrame(data.data, columns=data.feature_names)
-        df['target'] = data.target
-        poly = PolynomialFeatures(degree=3, include_bias=False)
-        X = df.drop(columns=['target'])
-        X = poly.fit_transform(X)
+    data = load_breast_cancer()
+    poly = PolynomialFeatures(degree=degree, include_bias=False)
+    X = poly.fit_transform(data.data)
 
-        # split into train and test sets
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, df['target'],
-            test_size=0.2, random_state=42,
-            stratify=df['target']
-        )
+    # split into train and test sets
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, data.target,
+        test_size=0.2, random_state=seed,
+        stratify=data.target
+    )
 
     # Standardize features
     scaler = StandardScaler()
     X_train = scaler.fit_transform(X_train)
 
-    # adding bias
-    X_train = np.hstack((X_train, np.ones((X_train.shape[0], 1))))
+    return X_train, y_train
+
+
+def _save_atomic(file, array):
+    '''
+    Writes array to file without exposing partially written files
+    '''
+
+    tmp = file.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp, file)
+
+
+# registry of available datasets
+DATASETS = {1: _load_breast_cancer}
+
+
+def load_dataset(dataset=1, degree=3, seed=42, cache_dir='data_cache',
+                 mmap=True):
+    '''
+    Loading the dataset
+
+    The standardized, bias-augmented training data are cached as .npy files
+    keyed by dataset, degree and split seed. Cached arrays are memory-mapped
+    (read-only) when mmap is True, so that worker processes share one copy.
+    '''
+
+    path = pathlib.Path(cache_dir)
+    key = f'dataset{dataset}_deg{degree}_seed{seed}'
+    file_X = path / f'{key}_X_train.npy'
+    file_y = path / f'{key}_y_train.npy'
+
+    if not (file_X.exists() and file_y.exists()):
+
+        X_train, y_train = DATASETS[dataset](degree, seed)
+
+        # adding bias
+        X_train = np.hstack((X_train, np.ones((X_train.shape[0], 1))))
+        y_train = np.asarray(y_train, dtype=float)
+
+        path.mkdir(parents=True, exist_ok=True)
+        _save_atomic(file_X, X_train)
+        _save_atomic(file_y, y_train)
+
+    mmap_mode = 'r' if mmap else None
+    X_train = np.load(file_X, mmap_mode=mmap_mode)
+    y_train = np.load(file_y, mmap_mode=mmap_mode)
 
     return X_train, y_train
 
 
+class SupportTracker:
+    '''
+    Tracks the support of the iterates of a method from the soft-threshold
+    masks computed in the Prox of Logistic_Regression (one update per
+    iteration).
+
+    nnz[k] is the size of the support after iteration k, and events lists
+    (k, entering, leaving) for the iterations where the support changed.
+    The support is stable once it is nonempty, at least min_it iterations
+    were run, and it did not change for patience iterations; the method
+    stop can be passed as stop= to the methods in optimization.py to end
+    runs there.
+
+    The tracker records a single run: call reset() before running another
+    method on the same Model.
+    '''
+
+    def __init__(self, patience=100, min_it=0):
+
+        self.patience = patience
+        self.min_it = min_it
+        self.reset()
+
+    def reset(self):
+
+        self.k = 0
+        self.mask = None
+        self.nnz = []
+        self.events = []
+        self.last_change = 0
+
+    def update(self, mask):
+
+        if self.mask is None:
+            changed = np.flatnonzero(mask)
+        else:
+            changed = np.flatnonzero(mask != self.mask)
+
+        if self.mask is None or changed.size:
+            entering = changed[mask[changed]]
+            leaving = changed[~mask[changed]]
+            self.events.append((self.k, entering, leaving))
+            self.last_change = self.k
+            nnz = self.nnz[-1] if self.nnz else 0
+            self.nnz.append(nnz + entering.size - leaving.size)
+        else:
+            self.nnz.append(self.nnz[-1])
+
+        self.mask = mask
+        self.k += 1
+
+    @property
+    def stable(self):
+
+        # an empty support is only stable because eps_k is still large
+        return (bool(self.nnz) and self.nnz[-1] > 0 and
+                self.k >= self.min_it and
+                self.k - self.last_change >= self.patience)
+
+    def stop(self, k, res, f, h):
+
+        return self.stable
+
+
 class Logistic_Regression:
 
-    def __init__(self, X_train, y_train):
+    def __init__(self, X_train, y_train, support=None):
 
         self.X_train = X_train
         self.y_train = y_train
+        self.support = support
         self.m = X_train.shape[0]
         self.dim = X_train.shape[1]
 
         self.L_2 = np.linalg.norm(X_train.T @ X_train, 2) / self.m
         self.L_1 = 0
 
+        # reference values, see set_reference
+        self.f_star = 0
+        self.h_star = 0
+        self.x_star = None
+
+    def set_reference(self, f_star, h_star, x_star=None):
+        '''
+        Attach reference values (e.g. from reference.load) so that obj and
+        obj_outer report gaps instead of raw values
+        '''
+
+        self.f_star = f_star
+        self.h_star = h_star
+        self.x_star = x_star
+
     def Prox(self, tau, eps_k, in_prox):
 
-        return st.prox_norm_ell_1(tau * eps_k, in_prox)
+        if self.support is None:
+            return st.prox_norm_ell_1(tau * eps_k, in_prox)
+
+        # soft-thresholding, sharing its mask with the support tracker
+        shrunk = np.abs(in_prox) - tau * eps_k
+        mask = shrunk > 0
+        self.support.update(mask)
+
+        return np.sign(in_prox) * np.maximum(shrunk, 0)
 
     def Grad(self, eps_k, in_grad):
 
@@ -98,6 +230,17 @@ class Logistic_Regression:
 
         return 1 / self.m * (self.X_train.T @ (y_pred - self.y_train))
 
+    def Grad_Hess(self, eps_k, in_grad):
+        '''
+        gradient of the inner function at in_grad and weights w such that
+        its Hessian is X_train.T @ diag(w) @ X_train (one product with X)
+        '''
+
+        y_pred = st.sigmoid(self.X_train @ in_grad)
+        grad = 1 / self.m * (self.X_train.T @ (y_pred - self.y_train))
+
+        return grad, y_pred * (1 - y_pred) / self.m
+
     def res(self, x, x_old):
 
         return np.sum((x - x_old) ** 2)
@@ -107,9 +250,126 @@ class Logistic_Regression:
         y_pred = st.sigmoid(self.X_train @ x)
         y_pred = np.clip(y_pred, 1e-10, 1 - 1e-10)
 
-        return -np.mean(self.y_train * np.log(y_pred) +
-                        (1 - self.y_train) * np.log(1 - y_pred))
+        return self._gap(-np.mean(self.y_train * np.log(y_pred) +
+                                  (1 - self.y_train) * np.log(1 - y_pred)))
+
+    def _gap(self, loss):
+        '''
+        inner gap with respect to the reference; a negative gap means that
+        f_star is not optimal
+        '''
+
+        gap = loss - self.f_star
+        if gap < -1e-8 * max(1, abs(self.f_star)):
+            raise ValueError(f'Negative inner gap {gap:.3e}: the reference '
+                             'f_star is not optimal')
+
+        return gap
+
+    def obj_outer(self, x):
+
+        return np.abs(np.sum(np.abs(x)) - self.h_star)
+
+
+def kfold_masks(m, n_folds, seed=0):
+    '''
+    Training masks (m, n_folds) of a shuffled n_folds-fold cross-validation
+    '''
+
+    folds = np.random.default_rng(seed).permutation(m) % n_folds
+
+    return (folds[:, None] != np.arange(n_folds)[None, :]).astype(float)
+
+
+def bootstrap_masks(m, K, seed=0):
+    '''
+    Multiplicities (m, K) of K bootstrap replicates
+    '''
+
+    rng = np.random.default_rng(seed)
+    masks = np.zeros((m, K))
+    for k in range(K):
+        masks[:, k] = np.bincount(rng.integers(0, m, m), minlength=m)
+
+    return masks
+
+
+class Logistic_Regression_Batched:
+    '''
+    K logistic regression problems sharing X_train, trained jointly with
+    weights x of shape (dim, K), so that every pass over X_train is a GEMM.
+
+    Y_train is (m, K) (or (m,) to share the labels), masks (m, K) holds the
+    training rows (or multiplicities) of each problem, and eps_scale (K,)
+    multiplies the (shared) eps_k schedule by a constant per column.
+    Iterates must have shape (dim, K), also when K = 1.
+    '''
+
+    def __init__(self, X_train, Y_train, masks=None, eps_scale=None):
+
+        Y_train = np.asarray(Y_train, dtype=float)
+        if masks is not None and Y_train.ndim == 1:
+            Y_train = np.repeat(Y_train[:, None], masks.shape[1], axis=1)
+        elif Y_train.ndim == 1:
+            Y_train = Y_train[:, None]
+
+        if masks is None:
+            masks = np.ones_like(Y_train)
+
+        self.X_train = X_train
+        self.y_train = Y_train
+        self.masks = masks
+        self.m = X_train.shape[0]
+        self.dim = X_train.shape[1]
+        self.K = Y_train.shape[1]
+
+        # per-column weights of the averaged losses
+        counts = np.sum(masks, axis=0)
+        self.weights = masks / counts
+
+        if eps_scale is None:
+            eps_scale = np.ones(self.K)
+        self.eps_scale = np.asarray(eps_scale, dtype=float)
+
+        # ||X^T diag(w_k) X|| <= ||X||^2 max_i w_ik (0/1 masks or weights)
+        self.L_2 = np.linalg.norm(X_train, 2) ** 2 * np.max(self.weights)
+        self.L_1 = 0
+
+    def _check(self, x):
+
+        if np.ndim(x) != 2 or np.shape(x) != (self.dim, self.K):
+            raise ValueError(f'Expected weights of shape {(self.dim, self.K)}'
+                             f', got {np.shape(x)}')
+
+    def Prox(self, tau, eps_k, in_prox):
+
+        self._check(in_prox)
+
+        return st.prox_norm_ell_1_batch(tau * eps_k * self.eps_scale,
+                                        in_prox)
+
+    def Grad(self, eps_k, in_grad):
+
+        self._check(in_grad)
+        y_pred = st.sigmoid(self.X_train @ in_grad)
+
+        return self.X_train.T @ ((y_pred - self.y_train) * self.weights)
+
+    def res(self, x, x_old):
+
+        return np.sum((x - x_old) ** 2, axis=0)
+
+    def obj(self, x):
+
+        self._check(x)
+        y_pred = st.sigmoid(self.X_train @ x)
+        y_pred = np.clip(y_pred, 1e-10, 1 - 1e-10)
+
+        loss = (self.y_train * np.log(y_pred) +
+                (1 - self.y_train) * np.log(1 - y_pred))
+
+        return -np.sum(self.weights * loss, axis=0)
 
     def obj_outer(self, x):
 
-        return np.sum(np.abs(x))
+        return np.sum(np.abs(x), axis=0)
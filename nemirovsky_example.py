@@ -40,51 +40,121 @@ import numpy as np
 from scipy import sparse as sp
 import structures as st
 
+OPERATORS = ('csr', 'banded', 'matrix-free')
+
 
 class Nemirowki_Example:
     '''
     Inner : np.sum((self.mat @ x - self.off_set) ** 2) / 2
     Outer : ell_1
 
+    The lower bidiagonal operator has main diagonal eta(i) and lower
+    diagonal -1 on its leading J x J block and vanishes elsewhere. It can be
+    stored as a CSR matrix, as a banded (DIA) matrix, or applied matrix-free
+    from its two diagonals, which scales to dim ~ 10^7.
+
+    eta is either a number or a vectorized function of the index array.
     '''
 
-    def __init__(self, J, dim):
+    def __init__(self, J, dim, operator='csr', eta=1):
+
+        if operator not in OPERATORS:
+            raise ValueError(f'Unknown operator: {operator}')
 
+        self.J = J
         self.dim = dim
         self.scale = 50
+        self.operator = operator
 
         off_set = np.zeros(dim)
         off_set[0] = 1
         self.off_set = off_set
 
         # define function value matrix
-        self.eta = lambda it: 1
-        diag_lo = np.array([-1 for i in range(dim)])
-        diag_ma = np.array([self.eta(i) for i in range(dim)])
-
-        diag_ma[J:] = 0 * diag_ma[J:]
-        diag_lo[(J - 1):] = 0 * diag_lo[(J - 1):]
-
-        mat = sp.diags((diag_lo, diag_ma), (-1, 0), shape=(dim, dim),
-                       format='csr')
-
-        self.mat = mat
-        self.mat_square = mat.T @ mat
-        self.L_2 = sp.linalg.norm(self.mat_square, 2)
+        if callable(eta):
+            self.eta = eta
+        else:
+            self.eta = lambda it: eta * np.ones(len(it))
+        diag_ma = np.zeros(dim)
+        diag_ma[:J] = self.eta(np.arange(J))
+        diag_lo = np.zeros(dim - 1)
+        diag_lo[:(J - 1)] = -1
+        self.diag_ma = diag_ma
+        self.diag_lo = diag_lo
+
+        if operator == 'matrix-free':
+            from scipy.sparse import linalg as spla
+            self.mat = spla.LinearOperator((dim, dim), matvec=self._apply,
+                                           rmatvec=self._apply_T)
+        else:
+            fmt = 'csr' if operator == 'csr' else 'dia'
+            self.mat = sp.diags((diag_lo, diag_ma), (-1, 0), shape=(dim, dim),
+                                format=fmt)
+            self.mat_square = (self.mat.T @ self.mat).asformat(fmt)
+
+        self.grad_shift = self._apply_T(off_set)
+        self.L_2 = self._lipschitz()
         self.L_1 = 0
 
         x_opt = np.ones(dim)
         x_opt[J:] = self.scale * x_opt[J:]
         self.x_opt = x_opt
 
+        # tilt of the outer function and its optimal value
+        self.tilt = self.scale * np.ones(dim)
+        self.h_opt = np.sum(np.abs(self.x_opt - self.tilt))
+
+    def _apply(self, x):
+
+        out = self.diag_ma * x
+        out[1:] += self.diag_lo * x[:-1]
+
+        return out
+
+    def _apply_T(self, y):
+
+        out = self.diag_ma * y
+        out[:-1] += self.diag_lo * y[1:]
+
+        return out
+
+    def _lipschitz(self):
+        '''
+        Squared spectral norm of the operator; only its leading J x J block
+        is nonzero
+        '''
+
+        J = self.J
+
+        if J <= 2000:
+            block = np.diag(self.diag_ma[:J]) + np.diag(self.diag_lo[:J - 1],
+                                                        -1)
+            return np.linalg.norm(block, 2) ** 2
+
+        from scipy.sparse import linalg as spla
+        square = spla.LinearOperator((J, J), dtype=float,
+                                     matvec=lambda v: self._square(v, J))
+
+        return spla.eigsh(square, k=1, which='LM',
+                          return_eigenvectors=False)[0]
+
+    def _square(self, v, J):
+
+        x = np.zeros(self.dim)
+        x[:J] = v
+
+        return self._apply_T(self._apply(x))[:J]
+
     def Prox(self, tau, eps_k, in_prox):
 
-        return st.prox_norm_ell_1_tilted(tau * eps_k, in_prox,
-                                         self.scale * np.ones(self.dim))
+        return st.prox_norm_ell_1_tilted(tau * eps_k, in_prox, self.tilt)
 
     def Grad(self, eps_k, x):
 
-        return self.mat_square @ x - self.mat.T @ self.off_set
+        if self.operator == 'matrix-free':
+            return self._apply_T(self._apply(x)) - self.grad_shift
+
+        return self.mat_square @ x - self.grad_shift
 
     def res(self, x, x_old):
 
@@ -92,9 +162,8 @@ class Nemirowki_Example:
 
     def obj(self, x):
 
-        return np.sum((self.mat @ x - self.off_set) ** 2) / 2
+        return np.sum((self._apply(x) - self.off_set) ** 2) / 2
 
     def obj_outer(self, x):
 
-        return np.abs(np.sum(np.abs(x - self.scale * np.ones(self.dim)))
-                      - np.sum(np.abs(self.x_opt - self.scale * np.ones(self.dim))))
+        return np.abs(np.sum(np.abs(x - self.tilt)) - self.h_opt)
@@ -39,11 +39,29 @@ For any comment, please contact: enis.chenchene@gmail.com
 import numpy as np
 
 
-def bi_FISTA(x_init, alpha, sigma_e, sigma_t, s, c, delta, Model, maxit):
+def _check_metrics(metrics, tracer, stop):
+    '''
+    Asynchronous metrics are incompatible with tracer= and stop=
+    '''
+
+    if metrics is not None and tracer is not None:
+        raise ValueError('With metrics=, pass the tracer to AsyncMetrics')
+
+    if metrics is not None and stop is not None:
+        raise ValueError('stop= is not supported with metrics=')
+
+
+def bi_FISTA(x_init, alpha, sigma_e, sigma_t, s, c, delta, Model, maxit,
+             tracer=None, stop=None, metrics=None, state=None):
     '''
     Algorithm 2 in Section 3 of our paper.
+
+    If state is a dict, the run resumes from it (when non-empty) and the
+    final iteration counter and iterates are stored in it.
     '''
 
+    _check_metrics(metrics, tracer, stop)
+
     # storage
     Res = []
     Fs = []
@@ -52,8 +70,12 @@ def bi_FISTA(x_init, alpha, sigma_e, sigma_t, s, c, delta, Model, maxit):
     # initialize
     x_old = np.copy(x_init)
     x = np.copy(x_init)
+    k_init = 0
 
-    for k in range(maxit):
+    if state:
+        k_init, x, x_old = state['k'], state['x'], state['x_old']
+
+    for k in range(k_init, k_init + maxit):
 
         alp_k = 1 - alpha / (k + sigma_t + 1)
         eps_k = c / (k + sigma_e + 1) ** delta
@@ -63,17 +85,40 @@ def bi_FISTA(x_init, alpha, sigma_e, sigma_t, s, c, delta, Model, maxit):
         x = Model.Prox(s, eps_k, y - s * Model.Grad(eps_k, y))
 
         Res.append(Model.res(x, x_old))
+
+        if metrics is not None:
+            metrics.submit(k, Res[-1], x)
+            continue
+
         Fs.append(Model.obj(x))
         Hs.append(Model.obj_outer(x))
 
+        if tracer is not None:
+            tracer.record(k, Res[-1], Fs[-1], Hs[-1], x)
+
+        if stop is not None and stop(k, Res[-1], Fs[-1], Hs[-1]):
+            break
+
+    if metrics is not None:
+        Fs, Hs = metrics.collect()
+
+    if state is not None:
+        state.update(k=k_init + len(Res), x=x, x_old=x_old)
+
     return Res, Fs, Hs
 
 
-def Bi_PG(x_init, sigma_e, s, c, delta, Model, maxit):
+def Bi_PG(x_init, sigma_e, s, c, delta, Model, maxit, tracer=None,
+          stop=None, metrics=None, state=None):
     '''
     Algorithm 1 in Section 2 of our paper.
+
+    If state is a dict, the run resumes from it (when non-empty) and the
+    final iteration counter and iterate are stored in it.
     '''
 
+    _check_metrics(metrics, tracer, stop)
+
     # storage
     Res = []
     Fs = []
@@ -81,8 +126,12 @@ def Bi_PG(x_init, sigma_e, s, c, delta, Model, maxit):
 
     # initialize
     x = np.copy(x_init)
+    k_init = 0
 
-    for k in range(maxit):
+    if state:
+        k_init, x = state['k'], state['x']
+
+    for k in range(k_init, k_init + maxit):
 
         eps_k = c / (k + sigma_e + 1) ** (delta / 2)
 
@@ -90,13 +139,31 @@ def Bi_PG(x_init, sigma_e, s, c, delta, Model, maxit):
         x = Model.Prox(2 * s, eps_k, x - 2 * s * Model.Grad(eps_k, x))
 
         Res.append(Model.res(x, x_old))
+
+        if metrics is not None:
+            metrics.submit(k, Res[-1], x)
+            continue
+
         Fs.append(Model.obj(x))
         Hs.append(Model.obj_outer(x))
 
+        if tracer is not None:
+            tracer.record(k, Res[-1], Fs[-1], Hs[-1], x)
+
+        if stop is not None and stop(k, Res[-1], Fs[-1], Hs[-1]):
+            break
+
+    if metrics is not None:
+        Fs, Hs = metrics.collect()
+
+    if state is not None:
+        state.update(k=k_init + len(Res), x=x)
+
     return Res, Fs, Hs
 
 
-def FBi_PG(x_init, alpha, s, c, delta, Model, maxit):
+def FBi_PG(x_init, alpha, s, c, delta, Model, maxit, tracer=None,
+           stop=None, metrics=None):
     '''
     Fast Bi-level Proximal Gradient
 
@@ -107,6 +174,8 @@ def FBi_PG(x_init, alpha, s, c, delta, Model, maxit):
     To standardize, we use: gamma = delta, a = alpha - 1
 
     '''
+    _check_metrics(metrics, tracer, stop)
+
     # storage
     Res = []
     Fs = []
@@ -126,13 +195,28 @@ def FBi_PG(x_init, alpha, s, c, delta, Model, maxit):
         x = Model.Prox(s, eps_k, y - s * Model.Grad(eps_k, y))
 
         Res.append(Model.res(x, x_old))
+
+        if metrics is not None:
+            metrics.submit(k, Res[-1], x)
+            continue
+
         Fs.append(Model.obj(x))
         Hs.append(Model.obj_outer(x))
 
+        if tracer is not None:
+            tracer.record(k, Res[-1], Fs[-1], Hs[-1], x)
+
+        if stop is not None and stop(k, Res[-1], Fs[-1], Hs[-1]):
+            break
+
+    if metrics is not None:
+        Fs, Hs = metrics.collect()
+
     return Res, Fs, Hs
 
 
-def staBiM(x_init, sigma, c, delta, Model, maxit):
+def staBiM(x_init, sigma, c, delta, Model, maxit, tracer=None, stop=None,
+           metrics=None):
     '''
     Static Bilevel Method
 
@@ -141,6 +225,8 @@ def staBiM(x_init, sigma, c, delta, Model, maxit):
     bilevel optimization, '24
     '''
 
+    _check_metrics(metrics, tracer, stop)
+
     # storage
     Res = []
     Fs = []
@@ -158,13 +244,28 @@ def staBiM(x_init, sigma, c, delta, Model, maxit):
         x = Model.Prox(s, eps_k, x - s * Model.Grad(eps_k, x))
 
         Res.append(Model.res(x, x_old))
+
+        if metrics is not None:
+            metrics.submit(k, Res[-1], x)
+            continue
+
         Fs.append(Model.obj(x))
         Hs.append(Model.obj_outer(x))
 
+        if tracer is not None:
+            tracer.record(k, Res[-1], Fs[-1], Hs[-1], x)
+
+        if stop is not None and stop(k, Res[-1], Fs[-1], Hs[-1]):
+            break
+
+    if metrics is not None:
+        Fs, Hs = metrics.collect()
+
     return Res, Fs, Hs
 
 
-def Bi_SG_II(x_init, c, delta, Model, maxit):
+def Bi_SG_II(x_init, c, delta, Model, maxit, tracer=None, stop=None,
+             metrics=None):
     '''
     Bi-Sub-Gradient - Version II
 
@@ -173,6 +274,8 @@ def Bi_SG_II(x_init, c, delta, Model, maxit):
     Function, '23
     '''
 
+    _check_metrics(metrics, tracer, stop)
+
     # storage
     Res = []
     Fs = []
@@ -192,7 +295,143 @@ def Bi_SG_II(x_init, c, delta, Model, maxit):
         x = Model.Prox(s, eps_k, y)
 
         Res.append(Model.res(x, x_old))
+
+        if metrics is not None:
+            metrics.submit(k, Res[-1], x)
+            continue
+
         Fs.append(Model.obj(x))
         Hs.append(Model.obj_outer(x))
 
+        if tracer is not None:
+            tracer.record(k, Res[-1], Fs[-1], Hs[-1], x)
+
+        if stop is not None and stop(k, Res[-1], Fs[-1], Hs[-1]):
+            break
+
+    if metrics is not None:
+        Fs, Hs = metrics.collect()
+
     return Res, Fs, Hs
+
+
+def bi_ProxNewton(x_init, sigma_e, c, delta, Model, maxit, sweeps=3,
+                  tracer=None, stop=None, metrics=None, schedule='passes'):
+    '''
+    Proximal Newton diagonal bilevel method for an ell_1 outer function.
+
+    At each iteration, the direction d_k approximately minimizes the second
+    order model of the inner function at x_k plus eps_k |x_k + d|_1, using
+    a few sweeps of coordinate descent over the coordinates that are
+    nonzero or violate optimality. The step along d_k is found by
+    backtracking on f + eps_k |.|_1; if no sufficient decrease is found,
+    the iterate is kept.
+
+    With schedule='passes', eps_k = c / (p_k + sigma_e + 1) ** delta where
+    p_k is the number of passes over X_train so far, so that eps_k decays
+    with the work done as in Algorithm 2 (one pass per iteration); with
+    schedule='iterations', p_k = k.
+
+    Requires Model.X_train and Model.Grad_Hess (see Logistic_Regression).
+    '''
+
+    _check_metrics(metrics, tracer, stop)
+
+    # storage
+    Res = []
+    Fs = []
+    Hs = []
+
+    # columns of X are accessed one at a time
+    X = np.asfortranarray(Model.X_train)
+
+    # initialize
+    x = np.copy(x_init)
+    f = Model.obj(x)
+    passes = 1
+
+    for k in range(maxit):
+
+        p_k = passes if schedule == 'passes' else k
+        eps_k = c / (p_k + sigma_e + 1) ** delta
+
+        g, w = Model.Grad_Hess(eps_k, x)
+        d, cd_passes = _cd_ell_1(X, w, g, x, eps_k, sweeps)
+        passes += 2 + cd_passes
+
+        # backtracking (Armijo) on f + eps_k |.|_1
+        h = np.sum(np.abs(x))
+        decrease = g @ d + eps_k * (np.sum(np.abs(x + d)) - h)
+        x_new = x
+        t = 1
+        while t > 1e-10 and decrease < 0:
+            x_t = x + t * d
+            f_t = Model.obj(x_t)
+            passes += 1
+            phi_t = f_t + eps_k * np.sum(np.abs(x_t))
+            if phi_t <= f + eps_k * h + 1e-4 * t * decrease:
+                x_new = x_t
+                f = f_t
+                break
+            t = t / 2
+
+        x_old = x
+        x = x_new
+
+        # feed the support tracker of the Model, if any (no Prox call here)
+        if getattr(Model, 'support', None) is not None:
+            Model.support.update(x != 0)
+
+        Res.append(Model.res(x, x_old))
+
+        if metrics is not None:
+            metrics.submit(k, Res[-1], x)
+            continue
+
+        Fs.append(f)
+        Hs.append(Model.obj_outer(x))
+
+        if tracer is not None:
+            tracer.record(k, Res[-1], Fs[-1], Hs[-1], x)
+
+        if stop is not None and stop(k, Res[-1], Fs[-1], Hs[-1]):
+            break
+
+    if metrics is not None:
+        Fs, Hs = metrics.collect()
+
+    return Res, Fs, Hs
+
+
+def _cd_ell_1(X, w, g, x, tau, sweeps):
+    '''
+    Coordinate descent on
+
+        min_d  g @ d + (X @ d) @ (w * (X @ d)) / 2 + tau |x + d|_1
+
+    over the working set of coordinates with x_j != 0 or |g_j| > tau.
+    Returns d and the number of (equivalent) passes over X.
+    '''
+
+    d = np.zeros_like(x)
+    Xd = np.zeros(X.shape[0])
+    curv = np.einsum('ij,ij,i->j', X, X, w)
+
+    active = np.flatnonzero((x != 0) | (np.abs(g) > tau))
+
+    for _ in range(sweeps):
+        for j in active:
+
+            if curv[j] <= 0:
+                continue
+
+            col = X[:, j]
+            z = x[j] + d[j]
+            z_new = z - (g[j] + col @ (w * Xd)) / curv[j]
+            z_new = np.sign(z_new) * max(abs(z_new) - tau / curv[j], 0)
+
+            if z_new != z:
+                d[j] += z_new - z
+                Xd += (z_new - z) * col
+
+    return d, 1 + 2 * sweeps * len(active) / X.shape[1]
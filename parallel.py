@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+#
+#    Copyright (C) 2025 Radu Ioan Bot (radu.bot@univie.ac.at)
+#                       Enis Chenchene (enis.chenchene@univie.ac.at)
+#                       Robert Csetnek (robert.csetnek@univie.ac.at)
+#                       David Hulett (david.hulett@univie.ac.at)
+#
+#    This file is part of the example code repository for the paper:
+#
+#      R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+#      Accelerating Diagonal Methods for Bilevel Optimization:
+#      Unified Convergence via Continuous-Time Dynamics
+#      2025. DOI: 10.48550/arXiv.2505.14389.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+This file contains a data-parallel version of the logistic regression model
+used in Section 5.3 of:
+
+R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+Accelerating Diagonal Methods for Bilevel Optimization:
+Unified Convergence via Continuous-Time Dynamics.
+2025. DOI: 10.48550/arXiv.2505.14389.
+
+The rows of X_train are sharded across local worker processes which read
+them from shared memory (no pickled copies). At every call of Grad or obj the
+current point is written to a shared buffer, the workers compute partial
+gradients or losses in place, and the partials are summed by the caller.
+Workers are synchronized with a pair of barriers.
+
+For any comment, please contact: enis.chenchene@gmail.com
+"""
+
+import os
+import threading
+import weakref
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+import logistic_regression as lr
+import structures as st
+
+_GRAD = 0
+_OBJ = 1
+_STOP = 2
+
+_THREAD_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+
+def _attach(name, shape):
+
+    shm = shared_memory.SharedMemory(name=name)
+
+    return shm, np.ndarray(shape, dtype=float, buffer=shm.buf)
+
+
+def _worker(w, rows, m, layout, start, done):
+
+    shms = []
+    views = {}
+    for key, (name, shape) in layout.items():
+        shm, views[key] = _attach(name, shape)
+        shms.append(shm)
+
+    X = views['X'][rows]
+    y = views['y'][rows]
+    x = views['x']
+    cmd = views['cmd']
+    grads = views['grads']
+    losses = views['losses']
+
+    while True:
+
+        try:
+            start.wait()
+        except threading.BrokenBarrierError:
+            break
+        if cmd[0] == _STOP:
+            break
+
+        try:
+            z = X @ x
+
+            if cmd[0] == _GRAD:
+                grads[w] = X.T @ (st.sigmoid(z) - y) / m
+            else:
+                y_pred = np.clip(st.sigmoid(z), 1e-10, 1 - 1e-10)
+                losses[w] = -np.sum(y * np.log(y_pred) +
+                                    (1 - y) * np.log(1 - y_pred)) / m
+        except BaseException:
+            # let the caller fail instead of waiting for this worker
+            done.abort()
+            raise
+
+        try:
+            done.wait()
+        except threading.BrokenBarrierError:
+            break
+
+    del X, y, x, cmd, grads, losses, views
+    for shm in shms:
+        shm.close()
+
+
+def _release(shms, workers, start):
+    '''
+    Stops the workers and frees the shared memory (also run at garbage
+    collection if close was never called)
+    '''
+
+    start.abort()
+    for proc in workers:
+        proc.join(1)
+        if proc.is_alive():
+            proc.terminate()
+    workers.clear()
+
+    for shm in shms:
+        shm.unlink()
+        try:
+            shm.close()
+        except BufferError:
+            # views still exported in this process
+            pass
+
+
+class Sharded_Logistic_Regression(lr.Logistic_Regression):
+    '''
+    Logistic_Regression whose Grad and obj are evaluated by a pool of local
+    worker processes, each owning a contiguous block of rows of X_train.
+
+    Call close() (or use it as a context manager) to stop the workers and
+    release the shared memory. Grad and obj must not be called concurrently.
+    If a worker fails or does not answer within timeout seconds, they raise
+    RuntimeError.
+    '''
+
+    def __init__(self, X_train, y_train, workers=None, threads_per_worker=1,
+                 support=None, timeout=600):
+
+        workers = workers or os.cpu_count()
+        m, dim = X_train.shape
+
+        shapes = {'X': (m, dim), 'y': (m,), 'x': (dim,), 'cmd': (1,),
+                  'grads': (workers, dim), 'losses': (workers,)}
+        self._shms = {}
+        self._views = {}
+        for key, shape in shapes.items():
+            size = max(1, int(np.prod(shape))) * np.dtype(float).itemsize
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            self._shms[key] = shm
+            self._views[key] = np.ndarray(shape, dtype=float, buffer=shm.buf)
+
+        self._views['X'][:] = X_train
+        self._views['y'][:] = y_train
+
+        super().__init__(self._views['X'], self._views['y'], support)
+
+        ctx = mp.get_context('spawn')
+        self.timeout = timeout
+        self._start = ctx.Barrier(workers + 1)
+        self._done = ctx.Barrier(workers + 1)
+        self._workers = []
+        self._finalizer = weakref.finalize(self, _release,
+                                           list(self._shms.values()),
+                                           self._workers, self._start)
+
+        layout = {key: (shm.name, shapes[key])
+                  for key, shm in self._shms.items()}
+        bounds = np.linspace(0, m, workers + 1).astype(int)
+
+        # limit BLAS threads in the workers (read at their numpy import)
+        env = {var: os.environ.get(var) for var in _THREAD_VARS}
+        os.environ.update({var: str(threads_per_worker)
+                           for var in _THREAD_VARS})
+        try:
+            for w in range(workers):
+                proc = ctx.Process(target=_worker, daemon=True,
+                                   args=(w, slice(bounds[w], bounds[w + 1]),
+                                         m, layout, self._start, self._done))
+                proc.start()
+                self._workers.append(proc)
+        finally:
+            for var, value in env.items():
+                if value is None:
+                    os.environ.pop(var)
+                else:
+                    os.environ[var] = value
+
+    def _run(self, cmd, x):
+
+        if not self._workers:
+            raise RuntimeError('The workers have been stopped')
+
+        self._views['x'][:] = x
+        self._views['cmd'][0] = cmd
+
+        try:
+            self._start.wait(self.timeout)
+            self._done.wait(self.timeout)
+        except threading.BrokenBarrierError:
+            dead = [w for w, proc in enumerate(self._workers)
+                    if not proc.is_alive()]
+            self._abort()
+            raise RuntimeError(f'Sharded evaluation failed (dead workers: '
+                               f'{dead}, timeout: {self.timeout}s)') from None
+
+    def Grad(self, eps_k, in_grad):
+
+        self._run(_GRAD, in_grad)
+
+        return np.sum(self._views['grads'], axis=0)
+
+    def obj(self, x):
+
+        self._run(_OBJ, x)
+
+        return self._gap(np.sum(self._views['losses']))
+
+    def _abort(self):
+
+        self.X_train = np.array(self.X_train)
+        self.y_train = np.array(self.y_train)
+        self._views = {}
+        self._done.abort()
+        self._finalizer()
+
+    def close(self):
+
+        if not self._finalizer.alive:
+            return
+
+        self._views['cmd'][0] = _STOP
+        try:
+            self._start.wait(self.timeout)
+        except threading.BrokenBarrierError:
+            pass
+        for proc in self._workers:
+            proc.join(self.timeout)
+
+        self._abort()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *args):
+
+        self.close()
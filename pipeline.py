@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+#    Copyright (C) 2025 Radu Ioan Bot (radu.bot@univie.ac.at)
+#                       Enis Chenchene (enis.chenchene@univie.ac.at)
+#                       Robert Csetnek (robert.csetnek@univie.ac.at)
+#                       David Hulett (david.hulett@univie.ac.at)
+#
+#    This file is part of the example code repository for the paper:
+#
+#      R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+#      Accelerating Diagonal Methods for Bilevel Optimization:
+#      Unified Convergence via Continuous-Time Dynamics
+#      2025. DOI: 10.48550/arXiv.2505.14389.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+This file contains a pipelined evaluator of the objectives monitored by the
+methods used in Section 5 of:
+
+R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+Accelerating Diagonal Methods for Bilevel Optimization:
+Unified Convergence via Continuous-Time Dynamics.
+2025. DOI: 10.48550/arXiv.2505.14389.
+
+Iterates are copied into a ring of snapshot buffers and Model.obj and
+Model.obj_outer are evaluated on a background thread while the method
+computes the next iterate (numpy releases the GIL in the matrix products).
+
+For any comment, please contact: enis.chenchene@gmail.com
+"""
+
+import queue
+import threading
+import numpy as np
+
+
+class AsyncMetrics:
+    '''
+    Pass as metrics= to the methods in optimization.py. Values are collected
+    in order at the end of the run. submit only blocks when all depth
+    snapshot buffers are still waiting to be evaluated.
+
+    An optional tracer is fed from the background thread. The methods raise
+    ValueError if stop= or tracer= is passed together with metrics=, and
+    Model.obj and Model.obj_outer must be safe
+    to call concurrently with Model.Grad (this is not the case for
+    parallel.Sharded_Logistic_Regression).
+    '''
+
+    def __init__(self, Model, depth=4, tracer=None):
+
+        self.Model = Model
+        self.depth = depth
+        self.tracer = tracer
+
+        self._buffers = None
+        self._thread = None
+
+    def _start(self, x):
+
+        if self._buffers is None or self._buffers.shape[1:] != np.shape(x):
+            self._buffers = np.empty((self.depth,) + np.shape(x))
+
+        self._free = queue.Queue()
+        for slot in range(self.depth):
+            self._free.put(slot)
+        self._tasks = queue.Queue()
+
+        self._Fs = []
+        self._Hs = []
+        self._error = None
+
+        self._thread = threading.Thread(target=self._evaluate, daemon=True)
+        self._thread.start()
+
+    def submit(self, k, res, x):
+
+        if self._thread is None:
+            self._start(x)
+
+        slot = self._free.get()
+        np.copyto(self._buffers[slot], x)
+        self._tasks.put((k, res, slot))
+
+    def _evaluate(self):
+
+        while True:
+
+            task = self._tasks.get()
+            if task is None:
+                break
+
+            k, res, slot = task
+            x = self._buffers[slot]
+
+            try:
+                if self._error is None:
+                    self._Fs.append(self.Model.obj(x))
+                    self._Hs.append(self.Model.obj_outer(x))
+
+                    if self.tracer is not None:
+                        self.tracer.record(k, res, self._Fs[-1],
+                                           self._Hs[-1], x)
+            except Exception as error:
+                self._error = error
+
+            self._free.put(slot)
+
+    def collect(self):
+        '''
+        Waits for the pending evaluations and returns Fs, Hs
+        '''
+
+        if self._thread is None:
+            return [], []
+
+        self._tasks.put(None)
+        self._thread.join()
+        self._thread = None
+
+        if self._error is not None:
+            raise self._error
+
+        return self._Fs, self._Hs
@@ -36,41 +36,57 @@ Unified Convergence via Continuous-Time Dynamics.
 For any comment, please contact: enis.chenchene@gmail.com
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
-from scipy.stats.mstats import gmean
-from matplotlib.cm import ScalarMappable
-from matplotlib.colors import Normalize
-from matplotlib.colors import LinearSegmentedColormap
-from matplotlib import rc
 
-rc('font', **{'family': 'serif', 'serif': ['Times'], 'size': 15})
-rc('text', usetex=True)
+
+def _pyplot():
+    '''
+    Imports and configures matplotlib on first use (slow to import)
+    '''
+
+    import matplotlib.pyplot as plt
+    from matplotlib import rc
+
+    rc('font', **{'family': 'serif', 'serif': ['Times'], 'size': 15})
+    rc('text', usetex=True)
+
+    return plt
 
 
 def plot_nemirovsky(Res_Bi_PG, Res_biFI, Res_FBi_PG, Res_staBiM, Res_Bi_SG_II,
                     Obj_Bi_PG, Obj_biFI, Obj_FBi_PG, Obj_staBiM, Obj_Bi_SG_II,
                     Obj_H_Bi_PG, Obj_H_biFI, Obj_H_FBi_PG, Obj_H_staBiM,
-                    Obj_H_Bi_SG_II, maxit, Spects, cases):
+                    Obj_H_Bi_SG_II, maxit, Spects, cases, its=None):
+
+    from scipy.stats.mstats import gmean
+    from matplotlib.cm import ScalarMappable
+    from matplotlib.colors import Normalize
+    from matplotlib.colors import LinearSegmentedColormap
+
+    plt = _pyplot()
+
+    # iterations at which the values were stored (see results.Results)
+    if its is None:
+        its = np.arange(maxit)
 
     # plotting inner objectives
     plt.figure(figsize=(5, 5))
 
-    plt.loglog(Obj_Bi_PG, color='y', alpha=0.1)
-    plt.loglog(Obj_biFI, color='k', alpha=0.1)
-    plt.loglog(Obj_FBi_PG, color='g', alpha=0.1)
-    plt.loglog(Obj_staBiM, color='r', alpha=0.1)
-    plt.loglog(Obj_Bi_SG_II, color='b', alpha=0.1)
+    plt.loglog(its, Obj_Bi_PG, color='y', alpha=0.1)
+    plt.loglog(its, Obj_biFI, color='k', alpha=0.1)
+    plt.loglog(its, Obj_FBi_PG, color='g', alpha=0.1)
+    plt.loglog(its, Obj_staBiM, color='r', alpha=0.1)
+    plt.loglog(its, Obj_Bi_SG_II, color='b', alpha=0.1)
 
-    plt.loglog(gmean(Obj_Bi_PG, axis=1), color='y',
+    plt.loglog(its, gmean(Obj_Bi_PG, axis=1), color='y',
                label='Alg. 1', linewidth=2)
-    plt.loglog(gmean(Obj_biFI, axis=1), color='k',
+    plt.loglog(its, gmean(Obj_biFI, axis=1), color='k',
                label='Alg. 2', linewidth=2)
-    plt.loglog(gmean(Obj_FBi_PG, axis=1), color='g',
+    plt.loglog(its, gmean(Obj_FBi_PG, axis=1), color='g',
                label='FBi-PG', linewidth=2)
-    plt.loglog(gmean(Obj_staBiM, axis=1), color='r',
+    plt.loglog(its, gmean(Obj_staBiM, axis=1), color='r',
                label='staBiM', linewidth=2)
-    plt.loglog(gmean(Obj_Bi_SG_II, axis=1), color='b',
+    plt.loglog(its, gmean(Obj_Bi_SG_II, axis=1), color='b',
                label='Bi-SG-II', linewidth=2)
 
     plt.loglog(range(maxit), [1e3 / (k + 1) ** 1 for k in range(maxit)],
@@ -88,21 +104,21 @@ def plot_nemirovsky(Res_Bi_PG, Res_biFI, Res_FBi_PG, Res_staBiM, Res_Bi_SG_II,
 
     # plotting objectives outer (comparison)
     fig = plt.figure(figsize=(5, 5))
-    plt.loglog(Obj_H_Bi_PG, color='y', alpha=0.05)
-    plt.loglog(Obj_H_biFI, color='k', alpha=0.05)
-    plt.loglog(Obj_H_FBi_PG, color='g', alpha=0.05)
-    plt.loglog(Obj_H_staBiM, color='r', alpha=0.05)
-    plt.loglog(Obj_H_Bi_SG_II, color='b', alpha=0.05)
+    plt.loglog(its, Obj_H_Bi_PG, color='y', alpha=0.05)
+    plt.loglog(its, Obj_H_biFI, color='k', alpha=0.05)
+    plt.loglog(its, Obj_H_FBi_PG, color='g', alpha=0.05)
+    plt.loglog(its, Obj_H_staBiM, color='r', alpha=0.05)
+    plt.loglog(its, Obj_H_Bi_SG_II, color='b', alpha=0.05)
 
-    plt.loglog(gmean(Obj_H_Bi_PG, axis=1), color='y',
+    plt.loglog(its, gmean(Obj_H_Bi_PG, axis=1), color='y',
                label='Alg. 1', linewidth=2)
-    plt.loglog(gmean(Obj_H_biFI, axis=1), color='k',
+    plt.loglog(its, gmean(Obj_H_biFI, axis=1), color='k',
                label='Alg. 2', linewidth=2)
-    plt.loglog(gmean(Obj_H_FBi_PG, axis=1), color='g',
+    plt.loglog(its, gmean(Obj_H_FBi_PG, axis=1), color='g',
                label='FBi-PG', linewidth=2)
-    plt.loglog(gmean(Obj_H_staBiM, axis=1), color='r',
+    plt.loglog(its, gmean(Obj_H_staBiM, axis=1), color='r',
                label='staBiM', linewidth=2)
-    plt.loglog(gmean(Obj_H_Bi_SG_II, axis=1), color='b',
+    plt.loglog(its, gmean(Obj_H_Bi_SG_II, axis=1), color='b',
                label='Bi-SG-II', linewidth=2)
 
     plt.xlim(1e1, maxit)
@@ -117,21 +133,21 @@ def plot_nemirovsky(Res_Bi_PG, Res_biFI, Res_FBi_PG, Res_staBiM, Res_Bi_SG_II,
     # plotting distance to solution
     plt.figure(figsize=(5, 5))
 
-    plt.loglog(Res_Bi_PG, color='y', alpha=0.1)
-    plt.loglog(Res_biFI, color='k', alpha=0.1)
-    plt.loglog(Res_FBi_PG, color='g', alpha=0.1)
-    plt.loglog(Res_staBiM, color='r', alpha=0.1)
-    plt.loglog(Res_Bi_SG_II, color='b', alpha=0.1)
+    plt.loglog(its, Res_Bi_PG, color='y', alpha=0.1)
+    plt.loglog(its, Res_biFI, color='k', alpha=0.1)
+    plt.loglog(its, Res_FBi_PG, color='g', alpha=0.1)
+    plt.loglog(its, Res_staBiM, color='r', alpha=0.1)
+    plt.loglog(its, Res_Bi_SG_II, color='b', alpha=0.1)
 
-    plt.loglog(gmean(Res_Bi_PG, axis=1), color='y', linewidth=3,
+    plt.loglog(its, gmean(Res_Bi_PG, axis=1), color='y', linewidth=3,
                label='Alg. 1')
-    plt.loglog(gmean(Res_biFI, axis=1), color='k', linewidth=3,
+    plt.loglog(its, gmean(Res_biFI, axis=1), color='k', linewidth=3,
                label='Alg. 2')
-    plt.loglog(gmean(Res_FBi_PG, axis=1), color='g', linewidth=3,
+    plt.loglog(its, gmean(Res_FBi_PG, axis=1), color='g', linewidth=3,
                label='FBi-PG')
-    plt.loglog(gmean(Res_staBiM, axis=1), color='r', linewidth=3,
+    plt.loglog(its, gmean(Res_staBiM, axis=1), color='r', linewidth=3,
                label='staBiM')
-    plt.loglog(gmean(Res_Bi_SG_II, axis=1), color='b', linewidth=3,
+    plt.loglog(its, gmean(Res_Bi_SG_II, axis=1), color='b', linewidth=3,
                label='Bi-SG-II')
 
     plt.xlim(1e1, maxit)
@@ -156,7 +172,7 @@ def plot_nemirovsky(Res_Bi_PG, Res_biFI, Res_FBi_PG, Res_staBiM, Res_Bi_SG_II,
     for cs in range(cases):
         delta = Spects[cs]
         color = cmap(norm(Spects[cs]))
-        plt.loglog(Obj_H_biFI[:, cs], color=color, alpha=0.5)
+        plt.loglog(its, Obj_H_biFI[:, cs], color=color, alpha=0.5)
 
     plt.xlim(1e1, maxit)
     plt.ylabel(r'$|H(x_k) - H(x^*)|$')
@@ -183,7 +199,7 @@ def plot_nemirovsky(Res_Bi_PG, Res_biFI, Res_FBi_PG, Res_staBiM, Res_Bi_SG_II,
     for cs in range(cases):
         delta = Spects[cs]
         color = cmap(norm(delta))
-        plt.loglog(Obj_biFI[:, cs], color=color, alpha=0.5)
+        plt.loglog(its, Obj_biFI[:, cs], color=color, alpha=0.5)
 
     plt.xlim(1e1, maxit)
     plt.ylabel(r'$F(x_k) - \min F$')
@@ -199,6 +215,8 @@ def plot_logistic(Res_Bi_PG, Res_biFI, Res_FBi_PG, Res_staBiM, Res_Bi_SG_II,
                   Obj_H_Bi_PG, Obj_H_biFI, Obj_H_FBi_PG, Obj_H_staBiM,
                   Obj_H_Bi_SG_II, maxit):
 
+    plt = _pyplot()
+
     # plotting residual
     plt.figure(figsize=(5, 5))
 
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+#
+#    Copyright (C) 2025 Radu Ioan Bot (radu.bot@univie.ac.at)
+#                       Enis Chenchene (enis.chenchene@univie.ac.at)
+#                       Robert Csetnek (robert.csetnek@univie.ac.at)
+#                       David Hulett (david.hulett@univie.ac.at)
+#
+#    This file is part of the example code repository for the paper:
+#
+#      R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+#      Accelerating Diagonal Methods for Bilevel Optimization:
+#      Unified Convergence via Continuous-Time Dynamics
+#      2025. DOI: 10.48550/arXiv.2505.14389.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+This file contains a reference solver to compute high-accuracy inner-optimal
+values and outer-optimal (minimal ell_1 norm) solutions for the experiments
+in Section 5 of:
+
+R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+Accelerating Diagonal Methods for Bilevel Optimization:
+Unified Convergence via Continuous-Time Dynamics.
+2025. DOI: 10.48550/arXiv.2505.14389.
+
+The inner problem min f is solved with restarted FISTA. The outer problem
+min |x|_1 s.t. f(x) <= min f + tol_f is solved by bisection on the radius r
+of the ell_1-constrained problems min_{|x|_1 <= r} f(x). Results are cached
+by a fingerprint of the data. On linearly separable data min f is not
+attained; then inf f = 0 is used and there is no outer reference.
+
+For any comment, please contact: enis.chenchene@gmail.com
+"""
+
+import hashlib
+import pathlib
+import numpy as np
+import structures as st
+
+
+def fingerprint(Model, *params):
+    '''
+    Hash of the training data of Model and of the given parameters
+    '''
+
+    sha = hashlib.sha1()
+    for array in (Model.X_train, Model.y_train):
+        array = np.ascontiguousarray(array)
+        sha.update(str((array.dtype.str, array.shape)).encode())
+        sha.update(memoryview(array).cast('B'))
+    sha.update(repr(params).encode())
+
+    return sha.hexdigest()
+
+
+def _loss(Model, x):
+    '''
+    Raw logistic loss (independent of the reference attached to Model)
+    '''
+
+    y_pred = st.sigmoid(Model.X_train @ x)
+    y_pred = np.clip(y_pred, 1e-10, 1 - 1e-10)
+
+    return -np.mean(Model.y_train * np.log(y_pred) +
+                    (1 - Model.y_train) * np.log(1 - y_pred))
+
+
+def _fista(Model, x_init, proj, maxit, tol):
+    '''
+    FISTA with adaptive (function value) restart on min f over proj's set
+    '''
+
+    s = 1 / Model.L_2
+    x = proj(x_init)
+    y = np.copy(x)
+    t = 1
+    f_old = _loss(Model, x)
+
+    for k in range(maxit):
+
+        x_old = x
+        x = proj(y - s * Model.Grad(0, y))
+        f = _loss(Model, x)
+
+        if f > f_old:
+            # restart
+            t = 1
+            y = np.copy(x)
+        else:
+            t_old = t
+            t = (1 + np.sqrt(1 + 4 * t ** 2)) / 2
+            y = x + (t_old - 1) / t * (x - x_old)
+
+        f_old = f
+        if np.sum((x - x_old) ** 2) <= tol ** 2 * max(1, np.sum(x ** 2)):
+            break
+    else:
+        raise RuntimeError(f'FISTA reached maxit={maxit} without meeting '
+                           f'tol={tol}; no reference computed')
+
+    return x, f
+
+
+def separable(Model):
+    '''
+    Whether the training data are linearly separable (LP feasibility of
+    (2 y_i - 1) X_i @ w >= 1), in which case min f is not attained
+    '''
+
+    from scipy.optimize import linprog
+
+    sign = 2 * np.asarray(Model.y_train) - 1
+    X = np.asarray(Model.X_train)
+    result = linprog(np.zeros(Model.dim), A_ub=-(sign[:, None] * X),
+                     b_ub=-np.ones(Model.m), bounds=(None, None),
+                     method='highs')
+
+    return result.status == 0
+
+
+def solve(Model, x_init=None, tol_f=1e-6, rtol=1e-4, maxit=20000,
+          tol=1e-10):
+    '''
+    Computes (f_star, h_star, x_star) for Model, where f_star approximates
+    min f and x_star approximates the minimal ell_1-norm point with
+    f(x_star) <= f_star + tol_f.
+
+    f_star is the smallest value of f found by any of the subproblems, so
+    that the reported gaps are not negative along the reference runs.
+
+    On separable data inf f = 0 is not attained and there is no outer
+    optimal solution: (0, 0, None) is returned, so that obj reports the
+    exact inner gap and obj_outer the plain ell_1 norm. Raises
+    RuntimeError if FISTA does not converge within maxit.
+    '''
+
+    if separable(Model):
+        return 0.0, 0.0, None
+
+    if x_init is None:
+        x_init = np.zeros(Model.dim)
+
+    # inner problem
+    x_f, f_star = _fista(Model, x_init, lambda w: w, maxit, tol)
+
+    # sequential ell_1-constrained refinement
+    r_lo = 0
+    r_hi = np.sum(np.abs(x_f))
+    x_star = x_f
+
+    while r_hi - r_lo > rtol * r_hi:
+
+        r = (r_lo + r_hi) / 2
+        x_r, f_r = _fista(Model, x_star,
+                          lambda w: st.proj_ball_ell_1(r, w), maxit, tol)
+
+        # warm starts can improve on the inner solution
+        f_star = min(f_star, f_r)
+
+        if f_r <= f_star + tol_f:
+            r_hi = r
+            x_star = x_r
+        else:
+            r_lo = r
+
+    return f_star, np.sum(np.abs(x_star)), x_star
+
+
+def load(Model, cache_dir='reference_cache', **kwargs):
+    '''
+    Cached version of solve (failed solves are not cached)
+    '''
+
+    path = pathlib.Path(cache_dir)
+    file = path / f'{fingerprint(Model, sorted(kwargs.items()))}.npz'
+
+    if file.exists():
+        data = np.load(file)
+        x_star = data['x_star'] if 'x_star' in data else None
+        return float(data['f_star']), float(data['h_star']), x_star
+
+    f_star, h_star, x_star = solve(Model, **kwargs)
+
+    path.mkdir(parents=True, exist_ok=True)
+    arrays = {} if x_star is None else {'x_star': x_star}
+    np.savez(file, f_star=f_star, h_star=h_star, **arrays)
+
+    return f_star, h_star, x_star
+
+
+def target_gap(tol_f, tol_h=np.inf):
+    '''
+    Stopping rule for the methods in optimization.py: stops as soon as the
+    inner and outer gaps reported by the Model are below tol_f and tol_h
+    (for all columns, with batched models).
+    '''
+
+    def stop(k, res, f, h):
+
+        return np.all(f <= tol_f) and np.all(h <= tol_h)
+
+    return stop
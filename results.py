@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+#    Copyright (C) 2025 Radu Ioan Bot (radu.bot@univie.ac.at)
+#                       Enis Chenchene (enis.chenchene@univie.ac.at)
+#                       Robert Csetnek (robert.csetnek@univie.ac.at)
+#                       David Hulett (david.hulett@univie.ac.at)
+#
+#    This file is part of the example code repository for the paper:
+#
+#      R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+#      Accelerating Diagonal Methods for Bilevel Optimization:
+#      Unified Convergence via Continuous-Time Dynamics
+#      2025. DOI: 10.48550/arXiv.2505.14389.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+This file contains a memory-bounded container for the (iteration, case)
+matrices recorded in the experiments of Section 5 of:
+
+R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+Accelerating Diagonal Methods for Bilevel Optimization:
+Unified Convergence via Continuous-Time Dynamics.
+2025. DOI: 10.48550/arXiv.2505.14389.
+
+Matrices can be backed by .npy memmaps on disk, stored in float32 and/or as
+log10 values, and downsampled to log-spaced iterations (which is all the
+loglog plots in plots.py need).
+
+For any comment, please contact: enis.chenchene@gmail.com
+"""
+
+import pathlib
+import numpy as np
+
+
+class Results:
+    '''
+    One matrix of shape (len(its), cases) for each name. its are the stored
+    iterations: all of range(maxit), or about samples log-spaced ones.
+
+    With log=True, values must be non-negative and samples must be given:
+    reading a matrix decodes it into a float64 copy, which is only bounded
+    when the iterations are downsampled.
+    '''
+
+    def __init__(self, names, maxit, cases, dtype=np.float64, path=None,
+                 samples=None, log=False):
+
+        if log and samples is None:
+            raise ValueError('log=True requires samples (decoding makes '
+                             'dense float64 copies)')
+
+        if samples is None:
+            self.its = np.arange(maxit)
+        else:
+            self.its = np.unique(np.geomspace(1, maxit, samples).astype(int)
+                                 - 1)
+
+        self.maxit = maxit
+        self.cases = cases
+        self.log = log
+        self.path = path
+        self._data = {}
+
+        shape = (len(self.its), cases)
+        if path is not None:
+            path = pathlib.Path(path)
+            path.mkdir(parents=True, exist_ok=True)
+            np.save(path / 'its.npy', self.its)
+
+        for name in names:
+            if path is None:
+                self._data[name] = np.zeros(shape, dtype=dtype)
+            else:
+                self._data[name] = np.lib.format.open_memmap(
+                    path / f'{name}.npy', mode='w+', dtype=dtype, shape=shape)
+
+    def store(self, name, cs, values):
+        '''
+        Stores the values of the maxit iterations of case cs
+        '''
+
+        values = np.asarray(values)[self.its]
+
+        if self.log:
+            with np.errstate(divide='ignore'):
+                values = np.log10(values)
+
+        self._data[name][:, cs] = values
+
+    def store_run(self, method, cs, run):
+        '''
+        Stores the (Res, Fs, Hs) returned by a method in optimization.py as
+        Res_<method>, Obj_<method> and Obj_H_<method>
+        '''
+
+        for prefix, values in zip(('Res', 'Obj', 'Obj_H'), run):
+            self.store(f'{prefix}_{method}', cs, values)
+
+    def __getitem__(self, name):
+
+        data = self._data[name]
+
+        if self.log:
+            return 10 ** data.astype(np.float64)
+
+        return data
+
+    def flush(self):
+
+        for data in self._data.values():
+            if isinstance(data, np.memmap):
+                data.flush()
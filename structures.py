@@ -70,6 +70,101 @@ def prox_norm_ell_1_tilted(tau, w, tilt):
     return tilt + prox_norm_ell_1(tau, w - tilt)
 
 
+def prox_norm_ell_1_batch(tau, W, out=None):
+    '''
+    computes the proximity operator of tau_j |.|_1 for each column W[:, j];
+    tau is a scalar or an array of shape (batch,)
+    '''
+
+    sign = np.sign(W)
+    out = np.abs(W, out=out)
+    out -= tau
+    np.maximum(out, 0, out=out)
+
+    return np.multiply(out, sign, out=out)
+
+
+def prox_norm_ell_2_batch(tau, W, out=None):
+    '''
+    computes the proximity operator of tau_j |.|_2 for each column W[:, j];
+    tau is a scalar or an array of shape (batch,)
+    '''
+
+    norm = np.atleast_1d(np.linalg.norm(W, axis=0))
+    scale = np.maximum(0, 1 - tau / np.maximum(norm, 1e-9))
+    scale[norm <= 1e-9] = 1
+
+    return np.multiply(W, scale, out=out)
+
+
+def prox_norm_ell_1_tilted_batch(tau, W, tilt, out=None):
+    '''
+    computes the proximity operator of tau_j |. - tilt|_1 for each column;
+    tilt has shape (dim,) or (dim, batch)
+    '''
+
+    tilt = _column(tilt, W)
+    out = prox_norm_ell_1_batch(tau, W - tilt, out=out)
+    out += tilt
+
+    return out
+
+
+def prox_norm_ell_2_tilted_batch(tau, W, tilt, out=None):
+    '''
+    computes the proximity operator of tau_j |. - tilt|_2 for each column;
+    tilt has shape (dim,) or (dim, batch)
+    '''
+
+    tilt = _column(tilt, W)
+    out = prox_norm_ell_2_batch(tau, W - tilt, out=out)
+    out += tilt
+
+    return out
+
+
+def prox_group_norm_batch(tau, W, starts, out=None):
+    '''
+    computes the proximity operator of tau_j sum_g |W[g, j]|_2 for each
+    column, where the groups g are contiguous blocks of rows beginning at
+    the indices starts (with starts[0] = 0)
+    '''
+
+    sizes = np.diff(np.append(starts, W.shape[0]))
+    norm = np.atleast_1d(np.sqrt(np.add.reduceat(W ** 2, starts, axis=0)))
+    scale = np.maximum(0, 1 - tau / np.maximum(norm, 1e-9))
+    scale[norm <= 1e-9] = 1
+
+    return np.multiply(W, np.repeat(scale, sizes, axis=0), out=out)
+
+
+def _column(tilt, W):
+
+    tilt = np.asarray(tilt)
+
+    return tilt[:, None] if tilt.ndim == 1 and W.ndim == 2 else tilt
+
+
+def proj_ball_ell_1(r, w):
+    '''
+    computes the projection of w onto the ell_1 ball of radius r
+    '''
+
+    abs_w = np.abs(w)
+
+    if np.sum(abs_w) <= r:
+        return w
+
+    # sort-based threshold (Duchi, Shalev-Shwartz, Singer, Chandra, '08)
+    u = np.sort(abs_w)[::-1]
+    css = np.cumsum(u) - r
+    ind = np.arange(1, len(u) + 1)
+    rho = np.nonzero(u * ind > css)[0][-1]
+    theta = css[rho] / (rho + 1)
+
+    return prox_norm_ell_1(theta, w)
+
+
 def _positive_sigmoid(x):
 
     return 1 / (1 + np.exp(-x))
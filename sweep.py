@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+#
+#    Copyright (C) 2025 Radu Ioan Bot (radu.bot@univie.ac.at)
+#                       Enis Chenchene (enis.chenchene@univie.ac.at)
+#                       Robert Csetnek (robert.csetnek@univie.ac.at)
+#                       David Hulett (david.hulett@univie.ac.at)
+#
+#    This file is part of the example code repository for the paper:
+#
+#      R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+#      Accelerating Diagonal Methods for Bilevel Optimization:
+#      Unified Convergence via Continuous-Time Dynamics
+#      2025. DOI: 10.48550/arXiv.2505.14389.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Command-line driver to run parameter sweeps of the methods in Section 5 of:
+
+R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+Accelerating Diagonal Methods for Bilevel Optimization:
+Unified Convergence via Continuous-Time Dynamics.
+2025. DOI: 10.48550/arXiv.2505.14389.
+
+Usage:
+
+    python3 sweep.py sweeps/nemirovsky.json [--workers N] [--dry-run]
+
+A sweep spec (JSON, TOML or YAML) lists blocks of the form
+
+    {"model": "nemirovsky", "sizes": {"J": [4], "dim": [7]},
+     "solvers": ["Bi_PG", "bi_FISTA"], "maxit": 2000,
+     "params": {"alpha": 4, "c": 10, "delta": {"linspace": [1.1, 1.9, 20]}}}
+
+together with the top-level keys "output", "workers", "seeds" and "record"
+({"every": k, "trace": bool, "iterates_every": k}). Each block is expanded
+into the product of its sizes, solvers, parameters and seeds. Parameters a
+solver does not take, and seeds of deterministic models, are dropped,
+duplicated jobs are removed, and jobs whose results (with the same recording
+policy) already exist in the output folder are skipped.
+
+For any comment, please contact: enis.chenchene@gmail.com
+"""
+
+import argparse
+import functools
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import pathlib
+import numpy as np
+import optimization as opt
+
+SOLVERS = {'bi_FISTA': opt.bi_FISTA,
+           'Bi_PG': opt.Bi_PG,
+           'FBi_PG': opt.FBi_PG,
+           'staBiM': opt.staBiM,
+           'Bi_SG_II': opt.Bi_SG_II,
+           'bi_ProxNewton': opt.bi_ProxNewton}
+
+# models whose jobs do not depend on the seed (x_init = 0)
+DETERMINISTIC = {'nemirovsky'}
+
+# solver arguments that are not hyperparameters
+_FIXED = {'x_init', 'Model', 'maxit', 'tracer', 'stop', 'metrics',
+          'state'}
+
+
+def load_spec(path):
+
+    path = pathlib.Path(path)
+
+    if path.suffix == '.json':
+        with open(path) as f:
+            return json.load(f)
+
+    if path.suffix == '.toml':
+        import tomllib
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+
+    if path.suffix in ('.yaml', '.yml'):
+        import yaml
+        with open(path) as f:
+            return yaml.safe_load(f)
+
+    raise ValueError(f'Unknown sweep spec format: {path.suffix}')
+
+
+def _values(value):
+    '''
+    Expands a parameter value into a list
+    '''
+
+    if isinstance(value, dict):
+        if 'linspace' in value:
+            return np.linspace(*value['linspace']).tolist()
+        if 'logspace' in value:
+            return np.logspace(*value['logspace']).tolist()
+        raise ValueError(f'Unknown parameter range: {value}')
+
+    if isinstance(value, list):
+        return value
+
+    return [value]
+
+
+def _grid(params):
+
+    names = sorted(params)
+    for values in itertools.product(*(_values(params[n]) for n in names)):
+        yield dict(zip(names, values))
+
+
+def job_id(job):
+
+    key = json.dumps(job, sort_keys=True)
+
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def expand(spec):
+    '''
+    Expands a sweep spec into a deduplicated list of jobs
+    '''
+
+    jobs = {}
+    seeds = spec.get('seeds', [0])
+    record = spec.get('record', {})
+
+    for block in spec['jobs']:
+
+        for sizes, solver, params, seed in itertools.product(
+                _grid(block.get('sizes', {})), block['solvers'],
+                _grid(block.get('params', {})), seeds):
+
+            args = inspect.signature(SOLVERS[solver]).parameters
+            used = {n: v for n, v in params.items()
+                    if n in args and n not in _FIXED}
+
+            job = {'model': block['model'], 'sizes': sizes,
+                   'solver': solver, 'params': used,
+                   'maxit': block.get('maxit', 1000), 'record': record}
+            if block['model'] not in DETERMINISTIC:
+                job['seed'] = seed
+            jobs.setdefault(job_id(job), job)
+
+    return jobs
+
+
+@functools.lru_cache(maxsize=4)
+def _build_model(model, sizes):
+
+    sizes = dict(sizes)
+
+    if model == 'nemirovsky':
+        import nemirovsky_example as nem
+        # unknown keys raise TypeError instead of being ignored
+        return nem.Nemirowki_Example(**{'J': 4, 'dim': 7, **sizes})
+
+    if model == 'logistic':
+        import logistic_regression as lr
+        X_train, y_train = lr.load_dataset(**sizes)
+        return lr.Logistic_Regression(X_train, y_train)
+
+    raise ValueError(f'Unknown model: {model}')
+
+
+def run_job(job, file):
+    '''
+    Runs a single job and stores Res, Fs, Hs in file (.npz)
+    '''
+
+    Model = _build_model(job['model'], tuple(sorted(job['sizes'].items())))
+
+    params = dict(job['params'])
+    solver = SOLVERS[job['solver']]
+    if 's' in inspect.signature(solver).parameters:
+        params.setdefault('s', 0.95 / Model.L_2)
+
+    if job['model'] in DETERMINISTIC:
+        x_init = np.zeros(Model.dim)
+    else:
+        x_init = np.random.default_rng(job['seed']).random(Model.dim)
+
+    record = job['record']
+    tracer = None
+    if record.get('trace', False):
+        import tracing
+        tracer = tracing.Tracer(file.with_suffix('.trace'),
+                                record.get('iterates_every', 0))
+
+    try:
+        Res, Fs, Hs = solver(x_init=x_init, Model=Model, maxit=job['maxit'],
+                             tracer=tracer, **params)
+    finally:
+        if tracer is not None:
+            tracer.close()
+
+    every = record.get('every', 1)
+    tmp = file.with_suffix(f'.{os.getpid()}.tmp.npz')
+    np.savez(tmp, Res=np.array(Res)[::every], Fs=np.array(Fs)[::every],
+             Hs=np.array(Hs)[::every], every=every,
+             job=json.dumps(job, sort_keys=True))
+    os.replace(tmp, file)
+
+    return file
+
+
+def run(spec, workers=None, dry_run=False):
+
+    output = pathlib.Path(spec.get('output', 'results/sweep'))
+    output.mkdir(parents=True, exist_ok=True)
+    jobs = expand(spec)
+    todo = {jid: job for jid, job in jobs.items()
+            if not (output / f'{jid}.npz').exists()}
+
+    print(f'{len(jobs)} jobs, {len(jobs) - len(todo)} already done')
+    if dry_run or not todo:
+        return
+
+    workers = workers or spec.get('workers') or os.cpu_count()
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from tqdm import tqdm
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_job, job, output / f'{jid}.npz')
+                   for jid, job in todo.items()]
+        for future in tqdm(as_completed(futures), total=len(futures)):
+            future.result()
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description='Run a sweep of experiments')
+    parser.add_argument('spec', help='sweep spec (.json, .toml or .yaml)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='only print the number of jobs')
+    args = parser.parse_args(argv)
+
+    run(load_spec(args.spec), args.workers, args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
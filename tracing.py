@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+#
+#    Copyright (C) 2025 Radu Ioan Bot (radu.bot@univie.ac.at)
+#                       Enis Chenchene (enis.chenchene@univie.ac.at)
+#                       Robert Csetnek (robert.csetnek@univie.ac.at)
+#                       David Hulett (david.hulett@univie.ac.at)
+#
+#    This file is part of the example code repository for the paper:
+#
+#      R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+#      Accelerating Diagonal Methods for Bilevel Optimization:
+#      Unified Convergence via Continuous-Time Dynamics
+#      2025. DOI: 10.48550/arXiv.2505.14389.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+This file contains a lightweight tracer to log the trajectories of the methods
+used in Section 5 of:
+
+R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+Accelerating Diagonal Methods for Bilevel Optimization:
+Unified Convergence via Continuous-Time Dynamics.
+2025. DOI: 10.48550/arXiv.2505.14389.
+
+Per-iteration scalars (and, optionally, sampled iterates) are buffered in
+fixed-size chunks and appended to a compressed columnar binary log by a
+background writer thread.
+
+For any comment, please contact: enis.chenchene@gmail.com
+"""
+
+import json
+import queue
+import struct
+import threading
+import zlib
+import numpy as np
+
+MAGIC = b'BTRACE1\n'
+SCALARS = ('k', 'res', 'f', 'h')
+
+
+class Tracer:
+    '''
+    Streams (k, res, f, h) and every iterate_every-th iterate to path.
+    '''
+
+    def __init__(self, path, iterate_every=0, chunk=4096, level=1):
+
+        self.iterate_every = iterate_every
+        self.chunk = chunk
+        self.level = level
+
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC)
+
+        self._queue = queue.Queue(maxsize=8)
+        self._error = None
+        self._writer = threading.Thread(target=self._write, daemon=True)
+        self._writer.start()
+
+        self._new_chunk()
+
+    def _new_chunk(self):
+
+        self._pos = 0
+        self._k = np.empty(self.chunk, dtype=np.int64)
+        self._scalars = np.empty((3, self.chunk))
+        self._its = []
+        self._xs = []
+
+    def record(self, k, res, f, h, x):
+
+        i = self._pos
+        self._k[i] = k
+        self._scalars[0, i] = res
+        self._scalars[1, i] = f
+        self._scalars[2, i] = h
+
+        if self.iterate_every and k % self.iterate_every == 0:
+            self._its.append(k)
+            self._xs.append(np.array(x, copy=True))
+
+        self._pos += 1
+        if self._pos == self.chunk:
+            self.flush()
+
+    def _check(self):
+
+        if self._error is not None:
+            raise RuntimeError('Trace writer failed') from self._error
+
+    def flush(self):
+
+        self._check()
+        if self._pos == 0:
+            return
+
+        n = self._pos
+        columns = {'k': self._k[:n], 'res': self._scalars[0, :n],
+                   'f': self._scalars[1, :n], 'h': self._scalars[2, :n]}
+        if self._its:
+            columns['x_k'] = np.array(self._its, dtype=np.int64)
+            columns['x'] = np.stack(self._xs)
+
+        self._queue.put(columns)
+        self._new_chunk()
+
+    def _write(self):
+
+        while True:
+            columns = self._queue.get()
+            if columns is None:
+                break
+
+            # after a failure, keep draining so that flush never blocks
+            if self._error is not None:
+                continue
+
+            try:
+                self._write_chunk(columns)
+            except Exception as error:
+                self._error = error
+
+    def _write_chunk(self, columns):
+
+        header = {}
+        blobs = []
+        for name, col in columns.items():
+            blob = zlib.compress(np.ascontiguousarray(col).tobytes(),
+                                 self.level)
+            header[name] = (col.dtype.str, col.shape, len(blob))
+            blobs.append(blob)
+
+        header = json.dumps(header).encode()
+        self._file.write(struct.pack('<I', len(header)))
+        self._file.write(header)
+        for blob in blobs:
+            self._file.write(blob)
+        self._file.flush()
+
+    def close(self):
+
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._writer.join()
+            self._file.close()
+
+        self._check()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *args):
+
+        self.close()
+
+
+def read_trace(path):
+    '''
+    Reads a log written by Tracer and returns a dict of concatenated columns.
+    '''
+
+    chunks = {}
+
+    with open(path, 'rb') as f:
+
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'{path} is not a trace file')
+
+        while True:
+            size = f.read(4)
+            if len(size) < 4:
+                break
+
+            header = json.loads(f.read(struct.unpack('<I', size)[0]))
+            for name, (dtype, shape, nbytes) in header.items():
+                col = np.frombuffer(zlib.decompress(f.read(nbytes)),
+                                    dtype=dtype).reshape(shape)
+                chunks.setdefault(name, []).append(col)
+
+    trace = {name: np.concatenate(cols) for name, cols in chunks.items()}
+    for name in SCALARS:
+        trace.setdefault(name, np.empty(0))
+
+    return trace
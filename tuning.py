@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+#    Copyright (C) 2025 Radu Ioan Bot (radu.bot@univie.ac.at)
+#                       Enis Chenchene (enis.chenchene@univie.ac.at)
+#                       Robert Csetnek (robert.csetnek@univie.ac.at)
+#                       David Hulett (david.hulett@univie.ac.at)
+#
+#    This file is part of the example code repository for the paper:
+#
+#      R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+#      Accelerating Diagonal Methods for Bilevel Optimization:
+#      Unified Convergence via Continuous-Time Dynamics
+#      2025. DOI: 10.48550/arXiv.2505.14389.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+This file contains a tuner for the parameters (alpha, c, delta, sigma_e,
+sigma_t) of Algorithms 1 and 2 in:
+
+R. I. Bot, E. Chenchene, R. Csetnek, D. Hulett.
+Accelerating Diagonal Methods for Bilevel Optimization:
+Unified Convergence via Continuous-Time Dynamics.
+2025. DOI: 10.48550/arXiv.2505.14389.
+
+Configurations are run for a short budget, scored on inner and outer
+progress, and only the best 1 / eta are continued (successive halving).
+Continued runs resume from their saved state instead of restarting.
+Hyperband runs several successive halving brackets with different
+trade-offs between number of configurations and initial budget.
+
+For any comment, please contact: enis.chenchene@gmail.com
+"""
+
+import inspect
+import numpy as np
+import optimization as opt
+
+SOLVERS = {'bi_FISTA': opt.bi_FISTA, 'Bi_PG': opt.Bi_PG}
+
+# (low, high, log scale)
+SPACE = {'alpha': (3, 10, False),
+         'c': (1e-1, 1e3, True),
+         'delta': (1.05, 1.99, False),
+         'sigma_e': (1e-1, 1e2, True),
+         'sigma_t': (1, 1e2, True)}
+
+
+def sample(n, space=SPACE, seed=0):
+    '''
+    Draws n random configurations from space
+    '''
+
+    rng = np.random.default_rng(seed)
+    configs = []
+
+    for _ in range(n):
+        config = {}
+        for name, (low, high, log) in space.items():
+            if log:
+                config[name] = float(np.exp(rng.uniform(np.log(low),
+                                                        np.log(high))))
+            else:
+                config[name] = float(rng.uniform(low, high))
+        configs.append(config)
+
+    return configs
+
+
+def _ranks(values):
+
+    values = np.nan_to_num(np.asarray(values, dtype=float), nan=np.inf)
+
+    return np.argsort(np.argsort(values))
+
+
+def successive_halving(Model, x_init, configs, solver='bi_FISTA',
+                       min_it=100, max_it=10000, eta=3, weight=1):
+    '''
+    Returns the list of trials (dicts with config, k, f, h, score) sorted
+    from best to worst. The score of a trial is the rank of its last inner
+    value plus weight times the rank of its last outer value among the
+    trials of its rung.
+    '''
+
+    method = SOLVERS[solver]
+    args = inspect.signature(method).parameters
+    s = 0.95 / Model.L_2
+
+    trials = [{'config': {n: v for n, v in config.items() if n in args},
+               'state': {}, 'f': np.inf, 'h': np.inf, 'score': np.inf}
+              for config in configs]
+    active = trials
+    budget = min_it
+
+    while True:
+
+        for trial in active:
+            done = trial['state'].get('k', 0)
+            _, Fs, Hs = method(x_init, s=s, Model=Model,
+                               maxit=budget - done, state=trial['state'],
+                               **trial['config'])
+            if Fs:
+                trial['f'], trial['h'] = Fs[-1], Hs[-1]
+
+        scores = (_ranks([trial['f'] for trial in active]) +
+                  weight * _ranks([trial['h'] for trial in active]))
+        for trial, score in zip(active, scores):
+            trial['score'] = score
+            trial['k'] = trial['state']['k']
+
+        active = sorted(active, key=lambda trial: trial['score'])
+        # the survivors always run to max_it, so that brackets compare
+        if budget >= max_it:
+            break
+
+        active = active[:max(1, len(active) // eta)]
+        budget = min(budget * eta, max_it)
+
+    # survivors of the last rung first, then by score
+    trials.sort(key=lambda trial: (-trial['k'], trial['score']))
+    for trial in trials:
+        trial.pop('state')
+
+    return trials
+
+
+def hyperband(Model, x_init, solver='bi_FISTA', min_it=100, max_it=10000,
+              eta=3, weight=1, seed=0):
+    '''
+    Hyperband: successive halving brackets from many short runs to few long
+    runs. Returns the trials of all brackets sorted from best to worst.
+    '''
+
+    s_max = int(np.log(max_it / min_it) / np.log(eta) + 1e-9)
+    trials = []
+
+    for bracket in range(s_max, -1, -1):
+
+        n = int(np.ceil((s_max + 1) / (bracket + 1) * eta ** bracket))
+        configs = sample(n, seed=seed + bracket)
+        trials += successive_halving(Model, x_init, configs, solver,
+                                     max_it // eta ** bracket, max_it, eta,
+                                     weight)
+
+    # scores are ranks within each bracket: re-rank the full-budget trials
+    # of all brackets together
+    full = [trial for trial in trials if trial['k'] >= max_it]
+    scores = (_ranks([trial['f'] for trial in full]) +
+              weight * _ranks([trial['h'] for trial in full]))
+    for trial, score in zip(full, scores):
+        trial['score'] = score
+
+    # full-budget trials first, then by score (ties broken by f)
+    trials.sort(key=lambda trial: (-trial['k'], trial['score'], trial['f']))
+
+    return trials